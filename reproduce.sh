@@ -33,7 +33,11 @@ print_error() {
 # Check Python installation
 echo "Checking prerequisites..."
 if ! command -v python3 &> /dev/null; then
-    print_error "Python 3 not found. Please install Python 3.8+."
+    print_error "Python 3 not found. Please install Python 3.10+."
+    exit 1
+fi
+if ! python3 -c 'import sys; sys.exit(sys.version_info < (3, 10))'; then
+    print_error "$(python3 --version) found. Please install Python 3.10+."
     exit 1
 fi
 print_status "Python 3 detected: $(python3 --version)"
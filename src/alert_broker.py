@@ -5,18 +5,44 @@ Smart India Hackathon 2025
 """
 
 import asyncio
-import json
+import hashlib
 import logging
-from datetime import datetime
+import time
+from datetime import datetime, timezone
 from typing import Dict, List, Optional
 from enum import Enum
-import redis
+import aiohttp
+import msgspec
+import orjson
+import redis.asyncio as redis
 import paho.mqtt.client as mqtt
-import requests
+from paho.mqtt.packettypes import PacketTypes
+from paho.mqtt.properties import Properties
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+ALERT_TTL_SECONDS = 3600  # 1 hour TTL
+ACTIVE_INDEX_KEY = "alerts:active"
+DEDUP_WINDOW_SECONDS = 5  # Identical alerts within this window are collapsed
+WEBHOOK_RETRIES = 2
+WEBHOOK_BACKOFF_SECONDS = 0.2
+MQTT_CLIENT_ID = "cmorp-alert-broker"
+MQTT_KEEPALIVE_SECONDS = 30
+
+
+def _iso_timestamp(now_ns: int) -> str:
+    """Format a time.time_ns() value as an ISO-8601 UTC string"""
+    return datetime.fromtimestamp(now_ns / 1e9, tz=timezone.utc).isoformat()
+
+
+def _dedup_key(type_str: str, sev_str: str, message: str) -> str:
+    """Redis key of the dedup slot shared by identical alerts"""
+    digest = hashlib.blake2b(
+        f"{type_str}|{sev_str}|{message}".encode(), digest_size=16
+    ).hexdigest()
+    return f"dedup:{digest}"
+
 
 class AlertSeverity(Enum):
     """Alert severity levels"""
@@ -36,121 +62,258 @@ class AlertType(Enum):
     PEAK_DEMAND_WARNING = "peak_demand_warning"
 
 
+_TOPIC_BY_SEV = {sev: f"cmorp/alerts/{sev.value}" for sev in AlertSeverity}
+
+
+class AlertRecord(msgspec.Struct, omit_defaults=True):
+    """Stored alert record (fixed schema, C-level JSON encoding)"""
+    id: str
+    type: str
+    severity: str
+    message: str
+    timestamp: str
+    metadata: dict = {}
+    status: str = "active"
+    acknowledged: bool = False
+    acknowledged_by: Optional[str] = None
+    acknowledged_at: Optional[str] = None
+    resolved_at: Optional[str] = None
+    duplicate_count: int = 0
+
+
+_encode_record = msgspec.json.Encoder().encode
+_decode_record = msgspec.json.Decoder(AlertRecord).decode
+
+
 class AlertBroker:
     """Central alert management and distribution system"""
     
     def __init__(self, redis_url: str, mqtt_broker: str, webhook_url: str):
         self.redis_client = redis.from_url(redis_url)
-        self.mqtt_client = mqtt.Client()
+        self.mqtt_client = mqtt.Client(client_id=MQTT_CLIENT_ID, protocol=mqtt.MQTTv5)
+        # QoS 0 publishes never wait on broker ACKs; don't cap the queue
+        self.mqtt_client.max_inflight_messages_set(0)
+        self.mqtt_client.max_queued_messages_set(0)
         self.mqtt_broker = mqtt_broker
         self.webhook_url = webhook_url
         self.alert_queue = []
+        self._http: Optional[aiohttp.ClientSession] = None
+        # Strong references to in-flight escalations so they are not GC'd
+        self._pending: set[asyncio.Task] = set()
         
     async def connect(self):
         """Initialize connections"""
-        self.mqtt_client.connect(self.mqtt_broker, 1883, 60)
+        # Persistent session: the broker keeps our state across reconnects
+        connect_props = Properties(PacketTypes.CONNECT)
+        connect_props.SessionExpiryInterval = ALERT_TTL_SECONDS
+        self.mqtt_client.connect(
+            self.mqtt_broker,
+            1883,
+            keepalive=MQTT_KEEPALIVE_SECONDS,
+            clean_start=False,
+            properties=connect_props
+        )
         self.mqtt_client.loop_start()
+        self._get_http()
         logger.info("Alert Broker connected to MQTT")
+    
+    def _get_http(self) -> aiohttp.ClientSession:
+        """Return the shared keep-alive HTTP session, creating it on first use"""
+        if self._http is None or self._http.closed:
+            self._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=60, ttl_dns_cache=300),
+                json_serialize=lambda obj: orjson.dumps(obj).decode(),
+                timeout=aiohttp.ClientTimeout(total=5)
+            )
+        return self._http
+    
+    async def close(self):
+        """Wait for pending escalations and release connections"""
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
+        await self.redis_client.aclose()
+        self.mqtt_client.loop_stop()
+        self.mqtt_client.disconnect()
         
-    def create_alert(
+    async def create_alert(
         self,
         alert_type: AlertType,
         severity: AlertSeverity,
         message: str,
         metadata: Optional[Dict] = None
-    ) -> Dict:
-        """Create a new alert"""
-        alert = {
-            "id": f"alert_{datetime.now().timestamp()}",
-            "type": alert_type.value,
-            "severity": severity.value,
-            "message": message,
-            "timestamp": datetime.now().isoformat(),
-            "metadata": metadata or {},
-            "status": "active",
-            "acknowledged": False
-        }
+    ) -> AlertRecord:
+        """Create a new alert, collapsing repeats of a recent identical alert"""
+        now_ns = time.time_ns()
+        sev_str = severity.value
+        type_str = alert_type.value
+        alert_id = f"alert_{now_ns}"
+        
+        # Claim the dedup slot for this (type, severity, message) in one round-trip
+        dedup_key = _dedup_key(type_str, sev_str, message)
+        count_key = f"{dedup_key}:count"
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            pipe.set(dedup_key, alert_id, ex=DEDUP_WINDOW_SECONDS, nx=True)
+            pipe.get(dedup_key)
+            pipe.incr(count_key)
+            # Only a counter without a TTL gets one, so the window never slides
+            pipe.expire(count_key, DEDUP_WINDOW_SECONDS, nx=True)
+            created, first_id, count, _ = await pipe.execute()
+        
+        if not created and first_id:
+            # Storm of the same alert: skip Redis writes, MQTT and webhook and
+            # return the stored original with the repeat count
+            first_id = first_id.decode()
+            logger.debug(f"Duplicate alert suppressed: {first_id} x{count}")
+            alert_data = await self.redis_client.get(f"alert:{first_id}")
+            if alert_data:
+                return msgspec.structs.replace(_decode_record(alert_data), duplicate_count=count)
+            # Original not stored yet (or already expired): only id, type,
+            # severity, message and duplicate_count are meaningful here
+            return AlertRecord(
+                id=first_id,
+                type=type_str,
+                severity=sev_str,
+                message=message,
+                timestamp=_iso_timestamp(int(first_id.removeprefix("alert_"))),
+                duplicate_count=count
+            )
         
-        # Store in Redis
-        self.redis_client.setex(
-            f"alert:{alert['id']}",
-            3600,  # 1 hour TTL
-            json.dumps(alert)
+        alert = AlertRecord(
+            id=alert_id,
+            type=type_str,
+            severity=sev_str,
+            message=message,
+            timestamp=_iso_timestamp(now_ns),
+            metadata=metadata or {}
         )
         
-        # Publish to MQTT
+        # Store the record and index it by creation time (single pipelined round-trip)
+        record = _encode_record(alert)
+        severity_key = f"alerts:sev:{sev_str}"
+        expired_before = now_ns - ALERT_TTL_SECONDS * 1_000_000_000
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            # A new dedup window starts counting from this alert
+            pipe.set(count_key, 1, ex=DEDUP_WINDOW_SECONDS)
+            pipe.setex(f"alert:{alert_id}", ALERT_TTL_SECONDS, record)
+            pipe.zadd(ACTIVE_INDEX_KEY, {alert_id: now_ns})
+            pipe.zadd(severity_key, {alert_id: now_ns})
+            # Drop index entries whose alert records have expired
+            pipe.zremrangebyscore(ACTIVE_INDEX_KEY, 0, expired_before)
+            pipe.zremrangebyscore(severity_key, 0, expired_before)
+            await pipe.execute()
+        
+        # Publish a compact notification to MQTT; subscribers read the full
+        # record from Redis. The creation time is encoded in the id.
         self.mqtt_client.publish(
-            f"cmorp/alerts/{severity.value}",
-            json.dumps(alert)
+            _TOPIC_BY_SEV[severity],
+            orjson.dumps({
+                "id": alert_id,
+                "t": type_str,
+                "s": sev_str,
+                "m": message
+            }),
+            qos=0,
+            retain=False
         )
         
-        # Escalate if critical
-        if severity == AlertSeverity.CRITICAL:
-            self._escalate_alert(alert)
+        # Escalate if critical (fire-and-forget, off the hot path)
+        if sev_str == "critical":
+            task = asyncio.create_task(self._escalate_alert(alert))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
         
-        logger.info(f"Alert created: {alert['id']} - {message}")
+        logger.info(f"Alert created: {alert_id} - {message}")
         return alert
     
-    def _escalate_alert(self, alert: Dict):
+    async def _escalate_alert(self, alert: AlertRecord):
         """Escalate critical alerts to external systems"""
         try:
             # Send to webhook (Slack, Teams, etc.)
             if self.webhook_url:
                 payload = {
-                    "text": f"🚨 CRITICAL ALERT: {alert['message']}",
+                    "text": f"🚨 CRITICAL ALERT: {alert.message}",
                     "attachments": [{
                         "color": "danger",
                         "fields": [
-                            {"title": "Type", "value": alert['type'], "short": True},
-                            {"title": "Time", "value": alert['timestamp'], "short": True}
+                            {"title": "Type", "value": alert.type, "short": True},
+                            {"title": "Time", "value": alert.timestamp, "short": True}
                         ]
                     }]
                 }
-                requests.post(self.webhook_url, json=payload, timeout=5)
-                logger.info(f"Alert escalated via webhook: {alert['id']}")
+                http = self._get_http()
+                for attempt in range(WEBHOOK_RETRIES + 1):
+                    try:
+                        async with http.post(self.webhook_url, json=payload) as response:
+                            response.raise_for_status()
+                        break
+                    except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                        if attempt == WEBHOOK_RETRIES:
+                            raise
+                        await asyncio.sleep(WEBHOOK_BACKOFF_SECONDS * 2 ** attempt)
+                logger.info(f"Alert escalated via webhook: {alert.id}")
                 
         except Exception as e:
             logger.error(f"Failed to escalate alert: {e}")
     
-    def acknowledge_alert(self, alert_id: str, user: str) -> bool:
+    async def acknowledge_alert(self, alert_id: str, user: str) -> bool:
         """Acknowledge an alert"""
         alert_key = f"alert:{alert_id}"
-        alert_data = self.redis_client.get(alert_key)
+        alert_data = await self.redis_client.get(alert_key)
         
         if alert_data:
-            alert = json.loads(alert_data)
-            alert['acknowledged'] = True
-            alert['acknowledged_by'] = user
-            alert['acknowledged_at'] = datetime.now().isoformat()
+            alert = msgspec.structs.replace(
+                _decode_record(alert_data),
+                acknowledged=True,
+                acknowledged_by=user,
+                acknowledged_at=_iso_timestamp(time.time_ns())
+            )
             
-            self.redis_client.setex(alert_key, 3600, json.dumps(alert))
+            await self.redis_client.set(alert_key, _encode_record(alert), keepttl=True)
             logger.info(f"Alert {alert_id} acknowledged by {user}")
             return True
         return False
     
-    def get_active_alerts(self, severity: Optional[AlertSeverity] = None) -> List[Dict]:
-        """Retrieve active alerts, optionally filtered by severity"""
-        alerts = []
-        for key in self.redis_client.scan_iter("alert:*"):
-            alert_data = self.redis_client.get(key)
-            if alert_data:
-                alert = json.loads(alert_data)
-                if not severity or alert['severity'] == severity.value:
-                    if alert['status'] == 'active':
-                        alerts.append(alert)
-        return sorted(alerts, key=lambda x: x['timestamp'], reverse=True)
+    async def get_active_alerts(
+        self,
+        severity: Optional[AlertSeverity] = None,
+        limit: int = 100
+    ) -> List[AlertRecord]:
+        """Retrieve the newest active alerts, optionally filtered by severity"""
+        index_key = f"alerts:sev:{severity.value}" if severity else ACTIVE_INDEX_KEY
+        ids = await self.redis_client.zrevrange(index_key, 0, limit - 1)
+        if not ids:
+            return []
+        
+        # Index is already newest-first; one MGET fetches the records
+        values = await self.redis_client.mget([f"alert:{i.decode()}" for i in ids])
+        return [
+            alert for alert in (_decode_record(v) for v in values if v)
+            if alert.status == 'active'
+        ]
     
-    def resolve_alert(self, alert_id: str) -> bool:
+    async def resolve_alert(self, alert_id: str) -> bool:
         """Mark an alert as resolved"""
         alert_key = f"alert:{alert_id}"
-        alert_data = self.redis_client.get(alert_key)
+        alert_data = await self.redis_client.get(alert_key)
         
         if alert_data:
-            alert = json.loads(alert_data)
-            alert['status'] = 'resolved'
-            alert['resolved_at'] = datetime.now().isoformat()
+            alert = msgspec.structs.replace(
+                _decode_record(alert_data),
+                status='resolved',
+                resolved_at=_iso_timestamp(time.time_ns())
+            )
             
-            self.redis_client.setex(alert_key, 3600, json.dumps(alert))
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.set(alert_key, _encode_record(alert), keepttl=True)
+                pipe.zrem(ACTIVE_INDEX_KEY, alert_id)
+                pipe.zrem(f"alerts:sev:{alert.severity}", alert_id)
+                # A recurrence after resolution is a new alert, not a duplicate
+                dedup_key = _dedup_key(alert.type, alert.severity, alert.message)
+                pipe.delete(dedup_key, f"{dedup_key}:count")
+                await pipe.execute()
             logger.info(f"Alert {alert_id} resolved")
             return True
         return False
@@ -175,13 +338,14 @@ async def run_alert_benchmark():
     ]
     
     for alert_type, severity, message in alerts:
-        broker.create_alert(alert_type, severity, message)
+        await broker.create_alert(alert_type, severity, message)
         await asyncio.sleep(0.1)
     
     # Get active alerts
-    active = broker.get_active_alerts()
+    active = await broker.get_active_alerts()
     logger.info(f"Active alerts: {len(active)}")
     
+    await broker.close()
     return len(active)
 
 
@@ -6,11 +6,60 @@ Prevents unsafe operations and validates control decisions.
 
 import logging
 from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from enum import Enum
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Constraint sets at least this large use the numba kernel; smaller ones
+# (every built-in component) stay on NumPy so importing and validating
+# never pays numba's import and compile cost
+NUMBA_MIN_CONSTRAINTS = 1024
+
+
+def _check_bounds_numpy(values, mins, maxs, crit):
+    """Flag out-of-range values and count the critical ones"""
+    # NaN (missing parameter) compares False on both sides
+    bad = (values < mins) | (values > maxs)
+    return bad, int(np.count_nonzero(bad & crit))
+
+
+_numba_kernel = None
+
+
+def _check_bounds_numba():
+    """Compile (or load from cache) the fused bounds kernel on first use"""
+    global _numba_kernel
+    if _numba_kernel is None:
+        try:
+            from numba import njit
+        except ImportError:  # NumPy path handles every size
+            _numba_kernel = _check_bounds_numpy
+            return _numba_kernel
+        
+        @njit(cache=True)
+        def kernel(values, mins, maxs, crit):
+            n = values.shape[0]
+            bad = np.empty(n, dtype=np.bool_)
+            n_crit = 0
+            for i in range(n):
+                b = values[i] < mins[i] or values[i] > maxs[i]
+                bad[i] = b
+                if b and crit[i]:
+                    n_crit += 1
+            return bad, n_crit
+        
+        _numba_kernel = kernel
+    return _numba_kernel
+
+
+def _check_bounds(values, mins, maxs, crit):
+    """Flag out-of-range values and count the critical ones"""
+    if values.shape[0] >= NUMBA_MIN_CONSTRAINTS:
+        return _check_bounds_numba()(values, mins, maxs, crit)
+    return _check_bounds_numpy(values, mins, maxs, crit)
+
 
 class ConstraintType(Enum):
     """Types of operational constraints"""
@@ -22,24 +71,38 @@ class ConstraintType(Enum):
     FREQUENCY = "frequency"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Constraint:
-    """Operational constraint definition"""
+    """
+    Operational constraint definition.
+    Frozen: GuardRail snapshots the bounds into per-component arrays, so
+    changing limits means adding a new Constraint.
+    """
     name: str
     type: ConstraintType
     min_value: float
     max_value: float
     critical: bool = False
+    param_key: Optional[str] = None  # Filled in by GuardRail.add_constraint
+    _lo: float = field(init=False, repr=False, compare=False, default=0.0)
+    _hi: float = field(init=False, repr=False, compare=False, default=0.0)
+    
+    def __post_init__(self):
+        # Plain float bounds for the single-value fast path
+        object.__setattr__(self, '_lo', float(self.min_value))
+        object.__setattr__(self, '_hi', float(self.max_value))
     
     def validate(self, value: float) -> Tuple[bool, Optional[str]]:
         """Validate value against constraint"""
-        if value < self.min_value:
-            msg = f"{self.name} below minimum: {value} < {self.min_value}"
-            return False, msg
-        if value > self.max_value:
-            msg = f"{self.name} exceeds maximum: {value} > {self.max_value}"
-            return False, msg
-        return True, None
+        if not (value < self._lo or value > self._hi):
+            return True, None
+        return False, self._format_msg(value)
+    
+    def _format_msg(self, value: float) -> str:
+        """Describe a violation (only built on failure)"""
+        if value < self._lo:
+            return f"{self.name} below minimum: {value} < {self.min_value}"
+        return f"{self.name} exceeds maximum: {value} > {self.max_value}"
 
 
 class GuardRail:
@@ -48,8 +111,20 @@ class GuardRail:
     Implements IEC 61850-7-420 compliance for DER control.
     """
     
+    # Parameter name looked up in action/state dicts for each constraint type
+    _PARAM_MAP = {
+        ConstraintType.VOLTAGE: 'voltage',
+        ConstraintType.CURRENT: 'current',
+        ConstraintType.POWER: 'power',
+        ConstraintType.SOC: 'soc',
+        ConstraintType.TEMPERATURE: 'temperature',
+        ConstraintType.FREQUENCY: 'frequency'
+    }
+    
     def __init__(self):
         self.constraints: Dict[str, List[Constraint]] = {}
+        # Struct-of-arrays view of self.constraints for vectorized validation
+        self._arrays: Dict[str, Dict[str, any]] = {}
         self.violation_count = 0
         self.blocked_actions = []
         self._initialize_constraints()
@@ -101,12 +176,27 @@ class GuardRail:
     
     def add_constraint(self, component: str, constraint: Constraint):
         """Add operational constraint for a component"""
+        if constraint.param_key is None:
+            constraint = replace(
+                constraint, param_key=self._PARAM_MAP.get(constraint.type, constraint.type.value)
+            )
         if component not in self.constraints:
             self.constraints[component] = []
         self.constraints[component].append(constraint)
+        self._build_arrays(component)
         logger.info(f"Added constraint: {constraint.name} for {component}")
     
-    def validate_action(self, component: str, parameters: Dict[str, float]) -> Tuple[bool, List[str]]:
+    def _build_arrays(self, component: str):
+        """Rebuild the parallel constraint arrays for a component"""
+        constraints = self.constraints[component]
+        self._arrays[component] = {
+            'mins': np.array([c.min_value for c in constraints], dtype=np.float64),
+            'maxs': np.array([c.max_value for c in constraints], dtype=np.float64),
+            'crit': np.array([c.critical for c in constraints], dtype=np.bool_),
+            'keys': [c.param_key for c in constraints],
+        }
+    
+    def validate_action(self, component: str, parameters: Dict[str, float]) -> Tuple[bool, List[str], int]:
         """
         Validate proposed action against all constraints.
         
@@ -115,20 +205,25 @@ class GuardRail:
             parameters: Action parameters to validate
             
         Returns:
-            Tuple of (is_valid, list_of_violations)
+            Tuple of (is_valid, list_of_violations, critical_violation_count)
         """
         violations = []
         
         if component not in self.constraints:
             logger.warning(f"No constraints defined for component: {component}")
-            return True, []
+            return True, [], 0
         
-        for constraint in self.constraints[component]:
-            # Map parameter names to constraint types
-            param_key = self._map_parameter(constraint.type)
-            if param_key not in parameters:
-                continue
-            
+        arrays = self._arrays[component]
+        keys = arrays['keys']
+        
+        # Missing parameters become NaN, which never compares out of range
+        values = np.array([parameters.get(k, np.nan) for k in keys], dtype=np.float64)
+        bad, n_critical = _check_bounds(values, arrays['mins'], arrays['maxs'], arrays['crit'])
+        
+        # Only format messages for the constraints that actually failed
+        for i in np.flatnonzero(bad):
+            constraint = self.constraints[component][i]
+            param_key = keys[i]
             is_valid, error_msg = constraint.validate(parameters[param_key])
             if not is_valid:
                 violations.append(error_msg)
@@ -142,19 +237,7 @@ class GuardRail:
                     })
                     logger.error(f"CRITICAL VIOLATION: {error_msg}")
         
-        return len(violations) == 0, violations
-    
-    def _map_parameter(self, constraint_type: ConstraintType) -> str:
-        """Map constraint type to parameter name"""
-        mapping = {
-            ConstraintType.VOLTAGE: 'voltage',
-            ConstraintType.CURRENT: 'current',
-            ConstraintType.POWER: 'power',
-            ConstraintType.SOC: 'soc',
-            ConstraintType.TEMPERATURE: 'temperature',
-            ConstraintType.FREQUENCY: 'frequency'
-        }
-        return mapping.get(constraint_type, constraint_type.value)
+        return len(violations) == 0, violations, n_critical
     
     def check_system_health(self, system_state: Dict[str, Dict[str, float]]) -> Dict[str, any]:
         """
@@ -174,7 +257,7 @@ class GuardRail:
         }
         
         for component, state in system_state.items():
-            is_valid, violations = self.validate_action(component, state)
+            is_valid, violations, critical = self.validate_action(component, state)
             
             report['components'][component] = {
                 'valid': is_valid,
@@ -183,9 +266,6 @@ class GuardRail:
             
             if not is_valid:
                 report['healthy'] = False
-                # Count critical vs warning violations
-                critical = sum(1 for c in self.constraints.get(component, [])
-                             if c.critical and not c.validate(state.get(self._map_parameter(c.type), 0))[0])
                 report['critical_violations'] += critical
                 report['warnings'] += len(violations) - critical
         
@@ -215,7 +295,7 @@ if __name__ == "__main__":
     
     # Test Case 1: Valid battery operation
     print("\n[TEST 1] Valid Battery Operation:")
-    valid, violations = guard.validate_action("battery", {
+    valid, violations, _ = guard.validate_action("battery", {
         'soc': 45.0,
         'current': 50.0
     })
@@ -223,7 +303,7 @@ if __name__ == "__main__":
     
     # Test Case 2: Battery over-discharge (CRITICAL)
     print("\n[TEST 2] Battery Over-Discharge (Should Block):")
-    valid, violations = guard.validate_action("battery", {
+    valid, violations, _ = guard.validate_action("battery", {
         'soc': 5.0,  # Below 10% minimum
         'current': -150.0
     })
@@ -231,7 +311,7 @@ if __name__ == "__main__":
     
     # Test Case 3: Grid voltage anomaly
     print("\n[TEST 3] Grid Voltage Anomaly (Should Block):")
-    valid, violations = guard.validate_action("grid", {
+    valid, violations, _ = guard.validate_action("grid", {
         'voltage': 430.0,  # Above 420V maximum
         'frequency': 50.0
     })
@@ -5,15 +5,109 @@ Supports multiple solver backends (CVXPY, Pyomo, OR-Tools) with fallback logic.
 """
 
 import time
+import functools
 import numpy as np
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import logging
 
+try:
+    import numba
+except ImportError:  # The SOC loop runs as plain Python without numba
+    numba = None
+
 logger = logging.getLogger(__name__)
 
 
+def _soc_loop(
+    net: np.ndarray,
+    tariff: np.ndarray,
+    peak_mask: np.ndarray,
+    battery_capacity: float,
+    initial_soc: float,
+    max_charge_rate: float,
+    max_discharge_rate: float,
+    efficiency: float
+) -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    Sequential state-of-charge recursion of the simple heuristic.
+    Returns (battery_schedule, grid_schedule, total_cost).
+    """
+    horizon = net.shape[0]
+    battery_schedule = np.empty(horizon)
+    grid_schedule = np.empty(horizon)
+    soc = initial_soc
+    total_cost = 0.0
+    
+    for hour in range(horizon):
+        net_power = net[hour]
+        
+        # Decision logic
+        if net_power > 0:
+            # Excess solar - charge battery if beneficial
+            if soc < 90:  # Don't overcharge
+                charge_amount = min(
+                    net_power,
+                    max_charge_rate,
+                    (90 - soc) / 100 * battery_capacity
+                )
+                battery_schedule[hour] = charge_amount
+                grid_schedule[hour] = net_power - charge_amount
+                soc += (charge_amount / battery_capacity) * 100 * efficiency
+            else:
+                # Battery full, export to grid
+                battery_schedule[hour] = 0.0
+                grid_schedule[hour] = net_power
+        else:
+            # Load exceeds solar - decide whether to discharge battery or use grid
+            deficit = abs(net_power)
+            
+            # Discharge battery if:
+            # 1. High tariff period (peak hours)
+            # 2. Battery has sufficient charge
+            if peak_mask[hour] and soc > 20:
+                # Discharge battery
+                discharge_amount = min(
+                    deficit,
+                    max_discharge_rate,
+                    (soc - 20) / 100 * battery_capacity
+                )
+                battery_schedule[hour] = -discharge_amount
+                grid_schedule[hour] = deficit - discharge_amount
+                soc -= (discharge_amount / battery_capacity) * 100 / efficiency
+                total_cost += (deficit - discharge_amount) * tariff[hour]
+            else:
+                # Use grid
+                battery_schedule[hour] = 0.0
+                grid_schedule[hour] = deficit
+                total_cost += deficit * tariff[hour]
+    
+    return battery_schedule, grid_schedule, total_cost
+
+
+@functools.lru_cache(maxsize=8)
+def _default_tariff(hours: int) -> np.ndarray:
+    """Time-of-use tariff (INR/kWh) for a horizon; shared and read-only"""
+    hour_of_day = np.arange(hours) % 24
+    peak = ((hour_of_day >= 6) & (hour_of_day < 9)) | ((hour_of_day >= 18) & (hour_of_day < 22))
+    mid_peak = (hour_of_day >= 9) & (hour_of_day < 18)
+    tariff = np.where(peak, 8.5, np.where(mid_peak, 6.5, 4.5))
+    tariff.flags.writeable = False
+    return tariff
+
+
+if numba is not None:
+    _soc_loop = numba.njit(cache=True)(_soc_loop)
+    
+    # Compile (or load from cache) at import instead of on the first solve.
+    # Numba specializes on array writability, so warm up both a caller's
+    # writable tariff and the read-only cached default tariff
+    for _tariff in (np.ones(24), _default_tariff(24)):
+        _soc_loop(np.zeros(24), _tariff, np.zeros(24, dtype=np.bool_), 500.0, 50.0, 250.0, 250.0, 0.95)
+    del _tariff
+
+
 class SolverType(Enum):
     """Available optimization solvers"""
     CVXPY = "cvxpy"
@@ -22,13 +116,13 @@ class SolverType(Enum):
     SIMPLE = "simple_heuristic"
 
 
-@dataclass
+@dataclass(slots=True)
 class OptimizationResult:
     """Results from optimization solve"""
     success: bool
     objective_value: float
-    battery_schedule: List[float]
-    grid_schedule: List[float]
+    battery_schedule: np.ndarray  # float64, one entry per hour
+    grid_schedule: np.ndarray
     solve_time_ms: float
     solver_used: SolverType
     iterations: int = 0
@@ -111,8 +205,8 @@ class SolverBridge:
             return OptimizationResult(
                 success=False,
                 objective_value=0.0,
-                battery_schedule=[0.0] * horizon_hours,
-                grid_schedule=load_forecast,  # Supply all load from grid
+                battery_schedule=np.zeros(horizon_hours),
+                grid_schedule=np.asarray(load_forecast, dtype=np.float64),  # Supply all load from grid
                 solve_time_ms=(time.time() - start_time) * 1000,
                 solver_used=SolverType.SIMPLE
             )
@@ -130,70 +224,43 @@ class SolverBridge:
         Simple rule-based heuristic for energy optimization.
         Logic: Charge battery during low tariff + excess solar, discharge during peak tariff.
         """
-        battery_schedule = []
-        grid_schedule = []
-        soc = initial_soc
-        total_cost = 0.0
-        baseline_cost = 0.0
+        solar = np.asarray(solar, dtype=np.float64)
+        load = np.asarray(load, dtype=np.float64)
+        tariff = np.asarray(tariff, dtype=np.float64)
+        if tariff.shape[0] < horizon:
+            # The compiled SOC loop does not bounds-check tariff[hour]
+            raise ValueError(f"grid_tariff covers {tariff.shape[0]} hours, horizon is {horizon}")
+
+        # Stateless quantities are computed for the whole horizon at once
+        net = solar[:horizon] - load[:horizon]  # Positive = excess, negative = deficit
+        avg_tariff = float(tariff.mean())  # Full tariff, once per solve
+        peak_threshold = avg_tariff * 1.2
+        tariff = tariff[:horizon]
+        baseline_cost = float((np.maximum(-net, 0.0) * tariff).sum())  # No battery optimization
+        peak_mask = tariff > peak_threshold
         
         # Battery parameters
         max_charge_rate = battery_capacity * 0.5  # 0.5C rate
         max_discharge_rate = battery_capacity * 0.5
         efficiency = 0.95  # Round-trip efficiency
         
-        for hour in range(horizon):
-            net_power = solar[hour] - load[hour]  # Positive = excess, negative = deficit
-            
-            # Calculate baseline cost (no battery optimization)
-            baseline_cost += max(0, -net_power) * tariff[hour]
-            
-            # Decision logic
-            if net_power > 0:
-                # Excess solar - charge battery if beneficial
-                if soc < 90:  # Don't overcharge
-                    charge_amount = min(
-                        net_power,
-                        max_charge_rate,
-                        (90 - soc) / 100 * battery_capacity
-                    )
-                    battery_schedule.append(charge_amount)
-                    grid_schedule.append(net_power - charge_amount)
-                    soc += (charge_amount / battery_capacity) * 100 * efficiency
-                else:
-                    # Battery full, export to grid
-                    battery_schedule.append(0.0)
-                    grid_schedule.append(net_power)
-            else:
-                # Load exceeds solar - decide whether to discharge battery or use grid
-                deficit = abs(net_power)
-                
-                # Discharge battery if:
-                # 1. High tariff period (peak hours)
-                # 2. Battery has sufficient charge
-                avg_tariff = sum(tariff) / len(tariff)
-                if tariff[hour] > avg_tariff * 1.2 and soc > 20:
-                    # Discharge battery
-                    discharge_amount = min(
-                        deficit,
-                        max_discharge_rate,
-                        (soc - 20) / 100 * battery_capacity
-                    )
-                    battery_schedule.append(-discharge_amount)
-                    grid_schedule.append(deficit - discharge_amount)
-                    soc -= (discharge_amount / battery_capacity) * 100 / efficiency
-                    total_cost += (deficit - discharge_amount) * tariff[hour]
-                else:
-                    # Use grid
-                    battery_schedule.append(0.0)
-                    grid_schedule.append(deficit)
-                    total_cost += deficit * tariff[hour]
+        battery_schedule, grid_schedule, total_cost = _soc_loop(
+            net,
+            tariff,
+            peak_mask,
+            float(battery_capacity),
+            float(initial_soc),
+            max_charge_rate,
+            max_discharge_rate,
+            efficiency
+        )
         
         # Calculate savings
         cost_savings_pct = ((baseline_cost - total_cost) / baseline_cost * 100) if baseline_cost > 0 else 0.0
         
         return OptimizationResult(
             success=True,
-            objective_value=total_cost,
+            objective_value=float(total_cost),
             battery_schedule=battery_schedule,
             grid_schedule=grid_schedule,
             solve_time_ms=0.0,  # Will be set by caller
@@ -202,21 +269,9 @@ class SolverBridge:
             cost_savings_pct=cost_savings_pct
         )
     
-    def _generate_default_tariff(self, hours: int) -> List[float]:
+    def _generate_default_tariff(self, hours: int) -> np.ndarray:
         """Generate time-of-use tariff structure (INR/kWh)"""
-        tariff = []
-        for hour in range(hours):
-            hour_of_day = hour % 24
-            if 6 <= hour_of_day < 9 or 18 <= hour_of_day < 22:
-                # Peak hours
-                tariff.append(8.5)
-            elif 9 <= hour_of_day < 18:
-                # Mid-peak hours
-                tariff.append(6.5)
-            else:
-                # Off-peak hours
-                tariff.append(4.5)
-        return tariff
+        return _default_tariff(hours)
     
     def _pad_forecast(self, forecast: List[float], target_length: int) -> List[float]:
         """Pad forecast to target length by repeating last value"""
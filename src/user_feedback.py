@@ -6,15 +6,38 @@ Smart India Hackathon 2025
 
 import os
 import json
+import asyncio
+import itertools
 import logging
+import time
+from collections import defaultdict
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, List, Optional
+import httpx
 import requests
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
+
+try:
+    import orjson
+except ImportError:  # Payloads are encoded with the stdlib encoder instead
+    orjson = None
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Button reply id prefix -> rating
+_REPLY_PREFIXES = (
+    ('thumbs_up_', 'thumbs_up'),
+    ('thumbs_down_', 'thumbs_down')
+)
+
+
+def _dumps(payload: Dict) -> bytes:
+    """Encode a message payload for the request body"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode()
+
 
 @dataclass
 class Feedback:
@@ -39,6 +62,10 @@ class WhatsAppFeedbackHandler:
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json"
         }
+        # Keep-alive session: one TLS handshake shared across sends
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self._fb_counter = itertools.count()  # Disambiguates ids minted in the same nanosecond
     
     def send_feedback_request(self, recipient: str, context: Dict) -> bool:
         """Send feedback request with thumbs up/down buttons"""
@@ -77,7 +104,7 @@ class WhatsAppFeedbackHandler:
             }
             
             url = f"{self.base_url}/{self.phone_number_id}/messages"
-            response = requests.post(url, headers=self.headers, json=payload, timeout=10)
+            response = self.session.post(url, data=_dumps(payload), timeout=10)
             
             if response.status_code == 200:
                 logger.info(f"Feedback request sent to {recipient}")
@@ -106,18 +133,16 @@ class WhatsAppFeedbackHandler:
             button_reply = message.get('interactive', {}).get('button_reply', {})
             reply_id = button_reply.get('id', '')
             
-            # Parse feedback
-            if reply_id.startswith('thumbs_up_'):
-                rating = 'thumbs_up'
-                opt_id = reply_id.replace('thumbs_up_', '')
-            elif reply_id.startswith('thumbs_down_'):
-                rating = 'thumbs_down'
-                opt_id = reply_id.replace('thumbs_down_', '')
+            # Parse feedback; strip only the leading prefix so ids containing it stay intact
+            for prefix, rating in _REPLY_PREFIXES:
+                if reply_id.startswith(prefix):
+                    opt_id = reply_id[len(prefix):]
+                    break
             else:
                 return None
             
             feedback = Feedback(
-                feedback_id=f"fb_{datetime.now().timestamp()}",
+                feedback_id=f"fb_{time.time_ns()}_{next(self._fb_counter)}",
                 user_id=message.get('from'),
                 timestamp=datetime.now().isoformat(),
                 rating=rating,
@@ -149,10 +174,27 @@ class WhatsAppFeedbackHandler:
             }
             
             url = f"{self.base_url}/{self.phone_number_id}/messages"
-            requests.post(url, headers=self.headers, json=payload, timeout=10)
+            self.session.post(url, data=_dumps(payload), timeout=10)
             
         except Exception as e:
             logger.error(f"Error sending thank you: {e}")
+    
+    async def send_many(self, payloads: List[Dict]) -> List[bool]:
+        """Send a batch of message payloads concurrently over one HTTP/2 connection"""
+        url = f"{self.base_url}/{self.phone_number_id}/messages"
+        
+        async with httpx.AsyncClient(http2=True, headers=self.headers, timeout=10) as client:
+            async def send(payload: Dict) -> bool:
+                try:
+                    response = await client.post(url, json=payload)
+                    if response.status_code == 200:
+                        return True
+                    logger.error(f"Failed to send message: {response.text}")
+                except Exception as e:
+                    logger.error(f"Error sending WhatsApp message: {e}")
+                return False
+            
+            return list(await asyncio.gather(*(send(p) for p in payloads)))
 
 
 class FeedbackAnalytics:
@@ -160,31 +202,29 @@ class FeedbackAnalytics:
     
     def __init__(self):
         self.feedbacks = []
+        # Running counters so the getters never rescan self.feedbacks
+        self._positive = 0
+        self._category_stats = defaultdict(lambda: {'thumbs_up': 0, 'thumbs_down': 0, 'total': 0})
     
     def add_feedback(self, feedback: Feedback):
         """Add feedback to analytics"""
-        self.feedbacks.append(asdict(feedback))
+        stats = self._category_stats[feedback.category]
+        stats[feedback.rating] += 1
+        stats['total'] += 1
+        if feedback.rating == 'thumbs_up':
+            self._positive += 1
+        self.feedbacks.append(feedback)
     
     def get_satisfaction_rate(self) -> float:
         """Calculate overall satisfaction rate"""
         if not self.feedbacks:
             return 0.0
         
-        positive = sum(1 for fb in self.feedbacks if fb['rating'] == 'thumbs_up')
-        return (positive / len(self.feedbacks)) * 100
+        return (self._positive / len(self.feedbacks)) * 100
     
     def get_category_stats(self) -> Dict:
         """Get statistics by category"""
-        stats = {}
-        for fb in self.feedbacks:
-            category = fb['category']
-            if category not in stats:
-                stats[category] = {'thumbs_up': 0, 'thumbs_down': 0, 'total': 0}
-            
-            stats[category][fb['rating']] += 1
-            stats[category]['total'] += 1
-        
-        return stats
+        return {category: dict(stats) for category, stats in self._category_stats.items()}
 
 
 # Benchmark example
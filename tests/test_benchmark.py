@@ -2,64 +2,63 @@
 Benchmark Testing Suite - C-MORP
 Comprehensive tests for system validation
 Smart India Hackathon 2025 - Target: 97% Coverage
+
+Timings come from the pytest-benchmark `benchmark` fixture.
 """
 
 import pytest
 import asyncio
+import json
+import socket
+import tempfile
 import time
 import numpy as np
-from typing import Dict, List
+from scipy.linalg import cho_factor, cho_solve, solve_triangular
+from scipy.linalg.blas import dsyrk
+from typing import Dict, List, Optional
 import sys
 import os
 
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'plugins'))
 
 from alert_broker import AlertBroker, AlertType, AlertSeverity
 from user_feedback import FeedbackAnalytics, Feedback
 from report_carbon import CarbonReporter
-from datetime import datetime
+from solver_bridge import SolverBridge
+from adapter_base import DeviceAdapter, SolarInverterAdapter
 
 import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-class BenchmarkMetrics:
-    """Store and calculate benchmark metrics"""
-    
-    def __init__(self):
-        self.metrics = {}
-        self.start_times = {}
-    
-    def start_timer(self, test_name: str):
-        """Start timing a test"""
-        self.start_times[test_name] = time.time()
-    
-    def end_timer(self, test_name: str) -> float:
-        """End timing and return duration"""
-        if test_name in self.start_times:
-            duration = time.time() - self.start_times[test_name]
-            self.metrics[test_name] = duration
-            return duration
-        return 0
-    
-    def get_report(self) -> Dict:
-        """Generate benchmark report"""
-        return {
-            'total_tests': len(self.metrics),
-            'total_time': sum(self.metrics.values()),
-            'average_time': np.mean(list(self.metrics.values())) if self.metrics else 0,
-            'fastest_test': min(self.metrics.items(), key=lambda x: x[1]) if self.metrics else None,
-            'slowest_test': max(self.metrics.items(), key=lambda x: x[1]) if self.metrics else None,
-            'details': self.metrics
-        }
+# Seeded generator and reusable input buffers shared by the numeric tests
+_RNG = np.random.default_rng(0)
+_SOLVER_SIZE = 100
+_SOLVER_A = np.empty((_SOLVER_SIZE, _SOLVER_SIZE))
+_SOLVER_B = np.empty(_SOLVER_SIZE)
+
+
+def _mean_seconds(benchmark) -> float:
+    """Mean round time in seconds; 0.0 when run with --benchmark-disable"""
+    return benchmark.stats.stats.mean if benchmark.stats else 0.0
 
 
-@pytest.fixture
-def benchmark():
-    """Fixture for benchmark metrics"""
-    return BenchmarkMetrics()
+def _fake_broker(published: List[str]) -> AlertBroker:
+    """AlertBroker on an in-memory Redis that records MQTT topics instead of publishing"""
+    fakeredis = pytest.importorskip('fakeredis')
+    broker = AlertBroker("redis://localhost:6379", "localhost", webhook_url="")
+    broker.redis_client = fakeredis.FakeAsyncRedis()
+    broker.mqtt_client.publish = lambda topic, payload, **kwargs: published.append(topic)
+    return broker
+
+
+@pytest.fixture(scope="session")
+def reporter():
+    """Carbon reporter shared across the session; tests that count history call reset()"""
+    return CarbonReporter(grid_type='mixed_grid')
 
 
 class TestOptimizationEngine:
@@ -67,52 +66,70 @@ class TestOptimizationEngine:
     
     def test_solver_speed(self, benchmark):
         """Test solver execution speed"""
-        benchmark.start_timer('solver_speed')
-        
         # Simulate optimization problem
-        size = 100
-        A = np.random.rand(size, size)
-        b = np.random.rand(size)
-        
-        # Solve linear system (simplified optimization)
-        solution = np.linalg.solve(A @ A.T + np.eye(size) * 0.1, b)
-        
-        duration = benchmark.end_timer('solver_speed')
+        size = _SOLVER_SIZE
+        A = _RNG.random(out=_SOLVER_A)
+        b = _RNG.random(out=_SOLVER_B)
+        
+        def solve():
+            # Solve linear system (simplified optimization); A A^T + 0.1 I is
+            # symmetric positive definite, so Cholesky replaces a general LU.
+            # SYRK fills only the lower triangle of A A^T; passing the C-ordered
+            # A as its Fortran-ordered transpose avoids a copy
+            M = dsyrk(1.0, A.T, trans=1, lower=1)
+            M.flat[::size + 1] += 0.1
+            c, low = cho_factor(M, lower=True, overwrite_a=True, check_finite=False)
+            return cho_solve((c, low), b, check_finite=False)
+        
+        solution = benchmark(solve)
+        duration = _mean_seconds(benchmark)
         
         assert solution is not None
         assert duration < 1.0, f"Solver took {duration:.3f}s, expected < 1.0s"
-        logger.info(f"✓ Solver speed test passed: {duration:.3f}s")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("✓ Solver speed test passed: %.3fs", duration)
     
     def test_solver_accuracy(self, benchmark):
         """Test optimization accuracy"""
-        benchmark.start_timer('solver_accuracy')
-        
-        # Known optimal solution
+        # Known optimal solution; a lower-triangular system is non-trivial
+        # but needs only forward substitution, no LU pivoting
         expected = np.array([1.0, 2.0, 3.0])
-        A = np.eye(3)
-        b = expected.copy()
+        A = np.tril(np.ones((3, 3)))
+        b = A @ expected
         
-        solution = np.linalg.solve(A, b)
+        solution = benchmark(solve_triangular, A, b, lower=True, check_finite=False)
         error = np.linalg.norm(solution - expected)
         
-        duration = benchmark.end_timer('solver_accuracy')
-        
         assert error < 1e-10, f"Solution error: {error}"
-        logger.info(f"✓ Solver accuracy test passed: error={error:.2e}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("✓ Solver accuracy test passed: error=%.2e", error)
     
     def test_constraint_handling(self, benchmark):
         """Test constraint satisfaction"""
-        benchmark.start_timer('constraint_handling')
-        
         # Battery SOC constraints: 20% <= SOC <= 80%
-        soc_values = np.random.uniform(20, 80, 100)
+        soc_values = _RNG.uniform(20, 80, 100)
         
-        violations = np.sum((soc_values < 20) | (soc_values > 80))
+        def count_violations():
+            # Outside [20, 80] is exactly a distance of more than 30 from the midpoint
+            return np.count_nonzero(np.abs(soc_values - 50.0) > 30.0)
         
-        duration = benchmark.end_timer('constraint_handling')
+        violations = benchmark(count_violations)
         
         assert violations == 0, f"Found {violations} constraint violations"
-        logger.info(f"✓ Constraint handling test passed")
+        logger.info("✓ Constraint handling test passed")
+    
+    def test_short_tariff_rejected(self):
+        """Test a tariff shorter than the horizon fails instead of reading past it"""
+        result = SolverBridge().optimize_energy_schedule(
+            solar_forecast=[0.0] * 24,
+            load_forecast=[100.0] * 24,
+            grid_tariff=[5.0]
+        )
+        
+        assert not result.success
+        assert result.objective_value == 0.0
+        assert np.array_equal(result.grid_schedule, np.full(24, 100.0))
+        logger.info("✓ Short tariff rejected")
 
 
 class TestDataProcessing:
@@ -120,50 +137,56 @@ class TestDataProcessing:
     
     def test_data_throughput(self, benchmark):
         """Test data processing throughput"""
-        benchmark.start_timer('data_throughput')
-        
         # Simulate 1000 data points
         data_points = 1000
         data = {
-            'timestamp': [datetime.now().isoformat() for _ in range(data_points)],
-            'power': np.random.uniform(0, 100, data_points),
-            'voltage': np.random.uniform(380, 420, data_points)
+            # One contiguous datetime64 column; render ISO strings only when serializing
+            'timestamp': np.full(data_points, np.datetime64('now'), dtype='datetime64[ns]'),
+            'power': _RNG.uniform(0, 100, data_points),
+            'voltage': _RNG.uniform(380, 420, data_points)
         }
         
-        # Process data
-        processed = {
-            'mean_power': np.mean(data['power']),
-            'max_voltage': np.max(data['voltage']),
-            'count': data_points
-        }
+        def process():
+            return {
+                'mean_power': np.mean(data['power']),
+                'max_voltage': np.max(data['voltage']),
+                'count': data_points
+            }
         
-        duration = benchmark.end_timer('data_throughput')
-        throughput = data_points / duration
+        processed = benchmark(process)
+        duration = _mean_seconds(benchmark)
+        throughput = data_points / duration if duration else float('inf')
         
+        assert processed['count'] == data_points
         assert throughput > 10000, f"Throughput: {throughput:.0f} points/s"
-        logger.info(f"✓ Data throughput: {throughput:.0f} points/s")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("✓ Data throughput: %.0f points/s", throughput)
     
     def test_data_validation(self, benchmark):
         """Test data validation rules"""
-        benchmark.start_timer('data_validation')
-        
         # Test data with known anomalies
         test_data = {
             'voltage': [230, 235, 228, 500, 232],  # 500 is anomaly
             'power': [50, 52, -10, 51, 49]  # -10 is anomaly
         }
         
-        # Validate voltage (200-250V range)
-        voltage_valid = [200 <= v <= 250 for v in test_data['voltage']]
+        voltage = np.asarray(test_data['voltage'])
+        power = np.asarray(test_data['power'])
         
-        # Validate power (>= 0)
-        power_valid = [p >= 0 for p in test_data['power']]
+        def validate():
+            # Validate voltage (200-250V range)
+            voltage_valid_count = int(((voltage >= 200) & (voltage <= 250)).sum())
+            
+            # Validate power (>= 0)
+            power_valid_count = int((power >= 0).sum())
+            
+            return voltage_valid_count, power_valid_count
         
-        duration = benchmark.end_timer('data_validation')
+        voltage_valid_count, power_valid_count = benchmark(validate)
         
-        assert sum(voltage_valid) == 4, "Voltage validation failed"
-        assert sum(power_valid) == 4, "Power validation failed"
-        logger.info(f"✓ Data validation test passed")
+        assert voltage_valid_count == 4, "Voltage validation failed"
+        assert power_valid_count == 4, "Power validation failed"
+        logger.info("✓ Data validation test passed")
 
 
 class TestAlertSystem:
@@ -171,196 +194,323 @@ class TestAlertSystem:
     
     def test_alert_creation_speed(self, benchmark):
         """Test alert creation performance"""
-        benchmark.start_timer('alert_creation')
-        
-        # Create multiple alerts
         num_alerts = 100
-        for i in range(num_alerts):
-            alert = {
-                'id': f'alert_{i}',
-                'type': 'test',
-                'severity': 'low',
-                'message': f'Test alert {i}'
+        
+        def create_alerts():
+            # Create multiple alerts as one array per field
+            seq = np.arange(num_alerts).astype('U8')
+            return {
+                'id': np.char.add('alert_', seq),
+                'type': np.full(num_alerts, 'test', dtype='U8'),
+                'severity': np.full(num_alerts, 'low', dtype='U8'),
+                'message': np.char.add('Test alert ', seq)
             }
         
-        duration = benchmark.end_timer('alert_creation')
-        rate = num_alerts / duration
+        alerts = benchmark(create_alerts)
+        duration = _mean_seconds(benchmark)
+        rate = num_alerts / duration if duration else float('inf')
         
+        assert alerts['message'][-1] == f'Test alert {num_alerts - 1}'
         assert rate > 1000, f"Alert creation rate: {rate:.0f} alerts/s"
-        logger.info(f"✓ Alert creation: {rate:.0f} alerts/s")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("✓ Alert creation: %.0f alerts/s", rate)
     
     def test_alert_escalation(self, benchmark):
         """Test alert escalation logic"""
-        benchmark.start_timer('alert_escalation')
-        
-        # Critical alert should escalate
-        critical_alert = {
-            'severity': 'critical',
-            'type': 'grid_overload',
-            'should_escalate': True
-        }
-        
-        # Low alert should not escalate
-        low_alert = {
-            'severity': 'low',
-            'type': 'info',
-            'should_escalate': False
-        }
+        def build_alerts():
+            # Critical alert should escalate
+            critical_alert = {
+                'severity': 'critical',
+                'type': 'grid_overload',
+                'should_escalate': True
+            }
+            
+            # Low alert should not escalate
+            low_alert = {
+                'severity': 'low',
+                'type': 'info',
+                'should_escalate': False
+            }
+            return critical_alert, low_alert
         
-        duration = benchmark.end_timer('alert_escalation')
+        critical_alert, low_alert = benchmark(build_alerts)
         
         assert critical_alert['should_escalate'] == True
         assert low_alert['should_escalate'] == False
-        logger.info(f"✓ Alert escalation logic test passed")
+        logger.info("✓ Alert escalation logic test passed")
+    
+    def test_duplicate_alert_suppressed(self):
+        """Test repeats within the dedup window return the stored original"""
+        published = []
+        broker = _fake_broker(published)
+        
+        async def run():
+            first = await broker.create_alert(
+                AlertType.GRID_OVERLOAD, AlertSeverity.HIGH, "Feeder 3 overloaded", {'feeder': 3}
+            )
+            repeat = await broker.create_alert(
+                AlertType.GRID_OVERLOAD, AlertSeverity.HIGH, "Feeder 3 overloaded"
+            )
+            active = await broker.get_active_alerts()
+            await broker.close()
+            return first, repeat, active
+        
+        first, repeat, active = asyncio.run(run())
+        
+        assert repeat.id == first.id
+        assert repeat.metadata == {'feeder': 3}
+        assert repeat.duplicate_count == 2
+        assert [alert.id for alert in active] == [first.id]
+        assert len(published) == 1
+        logger.info("✓ Duplicate alert suppressed")
+    
+    def test_alert_recurs_after_resolve(self):
+        """Test an alert raised again after resolution is not a duplicate"""
+        published = []
+        broker = _fake_broker(published)
+        
+        async def run():
+            first = await broker.create_alert(
+                AlertType.BATTERY_LOW, AlertSeverity.CRITICAL, "Battery bank B at 9%"
+            )
+            assert await broker.resolve_alert(first.id)
+            again = await broker.create_alert(
+                AlertType.BATTERY_LOW, AlertSeverity.CRITICAL, "Battery bank B at 9%"
+            )
+            active = await broker.get_active_alerts()
+            await broker.close()
+            return first, again, active
+        
+        first, again, active = asyncio.run(run())
+        
+        assert again.id != first.id
+        assert again.status == 'active'
+        assert again.duplicate_count == 0
+        assert [alert.id for alert in active] == [again.id]
+        assert len(published) == 2
+        logger.info("✓ Recurring alert re-raised after resolve")
 
 
 class TestCarbonReporting:
     """Test carbon reporting accuracy"""
     
-    def test_carbon_calculation(self, benchmark):
+    def test_carbon_calculation(self, benchmark, reporter):
         """Test carbon emission calculations"""
-        benchmark.start_timer('carbon_calculation')
-        
-        reporter = CarbonReporter(grid_type='mixed_grid')
-        
         # Test scenario: 100 kWh grid, 50 kWh renewable
-        metrics = reporter.calculate_emissions(
+        metrics = benchmark(
+            reporter.calculate_emissions,
             grid_consumption=100,
             solar_generation=50,
             wind_generation=0,
             battery_discharge=0
         )
         
-        duration = benchmark.end_timer('carbon_calculation')
-        
         # Expected: 50 kWh renewable saves 50 * 0.71 = 35.5 kg CO2
         expected_savings = 50 * 0.71
         
         assert abs(metrics.carbon_saved - expected_savings) < 0.1
         assert metrics.renewable_percentage == pytest.approx(33.33, rel=0.1)
-        logger.info(f"✓ Carbon calculation: {metrics.carbon_saved:.2f} kg CO2 saved")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("✓ Carbon calculation: %.2f kg CO2 saved", metrics.carbon_saved)
     
-    def test_report_generation(self, benchmark):
+    def test_report_generation(self, benchmark, reporter):
         """Test report generation performance"""
-        benchmark.start_timer('report_generation')
-        
-        reporter = CarbonReporter()
-        
-        # Add sample data
-        for _ in range(24):
-            reporter.calculate_emissions(100, 30, 20, 10)
-        
-        report = reporter.generate_daily_report()
+        reporter.reset()
+        
+        # Add a day of sample data in one batch
+        hours = 24
+        reporter.calculate_emissions_batch(
+            np.full(hours, 100.0),
+            np.full(hours, 30.0),
+            np.full(hours, 20.0),
+            np.full(hours, 10.0)
+        )
         
-        duration = benchmark.end_timer('report_generation')
+        report = benchmark(reporter.generate_daily_report)
+        duration = _mean_seconds(benchmark)
         
         assert 'total_carbon_saved_kg' in report
-        assert report['total_data_points'] == 24
-        logger.info(f"✓ Report generated in {duration:.3f}s")
+        assert report['metrics']['total_data_points'] == 24
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("✓ Report generated in %.3fs", duration)
+    
+    def test_batch_rejects_out_of_order_timestamps(self):
+        """Test batch ingestion keeps history time-ordered"""
+        reporter = CarbonReporter()
+        reporter.calculate_emissions(100, 30, 20, 10)
+        ones = np.ones(3)
+        
+        # Replaying a 3-day-old log after a live sample would hide that sample
+        stale = time.time_ns() - 3 * 86_400 * 10**9 + np.arange(3, dtype=np.int64)
+        with pytest.raises(ValueError):
+            reporter.calculate_emissions_batch(ones, ones, ones, ones, stale)
+        
+        live_ns = reporter.metrics_history.timestamp_ns[0]
+        unsorted = live_ns + np.array([2, 1, 3], dtype=np.int64)
+        with pytest.raises(ValueError):
+            reporter.calculate_emissions_batch(ones, ones, ones, ones, unsorted)
+        
+        # Forecast scenarios stamped ahead of now would sort after later live samples
+        future = time.time_ns() + 3_600 * 10**9 + np.arange(3, dtype=np.int64)
+        with pytest.raises(ValueError):
+            reporter.calculate_emissions_batch(ones, ones, ones, ones, future)
+        
+        assert len(reporter.metrics_history) == 1
+        logger.info("✓ Out-of-order batch rejected")
+
+
+class TestDeviceAdapters:
+    """Test device adapters against a real Modbus/TCP server"""
+    
+    def test_modbus_register_read(self):
+        """Test batched register reads through the installed pymodbus client"""
+        pytest.importorskip('pymodbus')
+        from pymodbus.datastore import ModbusDeviceContext, ModbusSequentialDataBlock, ModbusServerContext
+        from pymodbus.server import ModbusTcpServer
+        
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            port = sock.getsockname()[1]
+        
+        # Holding registers 0-9 of the inverter map; the block address is 1-based
+        registers = [452, 4155, 689, 0, 0, 2345, 0, 0, 983, 65115]
+        context = ModbusServerContext(
+            devices=ModbusDeviceContext(hr=ModbusSequentialDataBlock(1, registers)), single=True
+        )
+        
+        async def read() -> Dict:
+            server = ModbusTcpServer(context, address=('127.0.0.1', port))
+            serving = asyncio.create_task(server.serve_forever())
+            await asyncio.sleep(0.1)
+            try:
+                adapter = SolarInverterAdapter('inverter_1', {'ip': '127.0.0.1', 'port': port})
+                assert await adapter.connect()
+                return await adapter.read_data()
+            finally:
+                await DeviceAdapter.close_clients()
+                await server.shutdown()
+                await serving
+        
+        data = asyncio.run(read())
+        
+        assert data['power_output'] == pytest.approx(45.2)
+        assert data['energy_today'] == pytest.approx(234.5)
+        assert data['temperature'] == pytest.approx(-42.1)
+        logger.info("✓ Modbus register read passed")
 
 
 class TestSystemIntegration:
     """Integration tests for complete system"""
     
-    def test_end_to_end_flow(self, benchmark):
+    def test_end_to_end_flow(self, benchmark, reporter):
         """Test complete workflow"""
-        benchmark.start_timer('end_to_end')
-        
-        # 1. Data ingestion
-        sensor_data = {'power': 100, 'voltage': 230}
-        
-        # 2. Optimization
-        optimized = {'battery_power': -5, 'grid_import': 95}
-        
-        # 3. Carbon tracking
-        reporter = CarbonReporter()
-        metrics = reporter.calculate_emissions(95, 30, 20, 5)
-        
-        # 4. Alert check
-        if metrics.carbon_saved > 0:
-            alert_created = True
-        
-        duration = benchmark.end_timer('end_to_end')
+        def flow():
+            # 1. Data ingestion
+            sensor_data = {'power': 100, 'voltage': 230}
+            
+            # 2. Optimization
+            optimized = {'battery_power': -5, 'grid_import': 95}
+            
+            # 3. Carbon tracking
+            metrics = reporter.calculate_emissions(95, 30, 20, 5)
+            
+            # 4. Alert check
+            if metrics.carbon_saved > 0:
+                alert_created = True
+            return alert_created
+        
+        alert_created = benchmark(flow)
+        duration = _mean_seconds(benchmark)
         
         assert alert_created
         assert duration < 0.5, "End-to-end flow too slow"
-        logger.info(f"✓ End-to-end test passed: {duration:.3f}s")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("✓ End-to-end test passed: %.3fs", duration)
     
     def test_concurrent_operations(self, benchmark):
         """Test system under concurrent load"""
-        benchmark.start_timer('concurrent_ops')
-        
         # Simulate concurrent operations
-        operations = []
-        for i in range(50):
-            operations.append({'op_id': i, 'result': i * 2})
+        async def op(i: int) -> int:
+            return i * 2
         
-        results = [op['result'] for op in operations]
+        async def run_ops() -> List[int]:
+            return await asyncio.gather(*(op(i) for i in range(50)))
         
-        duration = benchmark.end_timer('concurrent_ops')
+        results = benchmark(lambda: asyncio.run(run_ops()))
+        duration = _mean_seconds(benchmark)
         
         assert len(results) == 50
-        logger.info(f"✓ Concurrent operations: {len(results)} ops in {duration:.3f}s")
+        assert results == list(range(0, 100, 2))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("✓ Concurrent operations: %d ops in %.3fs", len(results), duration)
 
 
-def run_all_benchmarks():
-    """Run all benchmark tests and generate report"""
+def run_all_benchmarks(workers: Optional[str] = None) -> Dict:
+    """
+    Run all benchmark tests through pytest and summarize the timings.
+    
+    workers (e.g. 'auto') spreads tests over pytest-xdist processes; pytest-benchmark
+    cannot time under xdist, so a parallel run only reports pass/fail.
+    """
     logger.info("="*60)
     logger.info("C-MORP BENCHMARK TEST SUITE")
     logger.info("Smart India Hackathon 2025")
     logger.info("="*60)
     
-    benchmark = BenchmarkMetrics()
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, 'benchmark.json')
+        args = [os.path.dirname(os.path.abspath(__file__)), f'--benchmark-json={json_path}']
+        if workers:
+            args += ['-n', workers, '--benchmark-disable']
+        else:
+            args.append('--benchmark-only')
+        
+        exit_code = pytest.main(args)
+        
+        benchmarks = []
+        if os.path.exists(json_path):
+            with open(json_path) as f:
+                benchmarks = json.load(f).get('benchmarks', [])
     
-    # Run test suites
-    test_suites = [
-        TestOptimizationEngine(),
-        TestDataProcessing(),
-        TestAlertSystem(),
-        TestCarbonReporting(),
-        TestSystemIntegration()
-    ]
+    # Running aggregates: one pass over the results, no rescans per statistic
+    means = {}
+    total_time = 0.0
+    fastest = (None, float('inf'))
+    slowest = (None, float('-inf'))
+    for bench in benchmarks:
+        name, mean = bench['name'], bench['stats']['mean']
+        means[name] = mean
+        total_time += mean
+        if mean < fastest[1]:
+            fastest = (name, mean)
+        if mean > slowest[1]:
+            slowest = (name, mean)
     
-    total_tests = 0
-    passed_tests = 0
-    
-    for suite in test_suites:
-        suite_name = suite.__class__.__name__
-        logger.info(f"\n--- Running {suite_name} ---")
-        
-        for method_name in dir(suite):
-            if method_name.startswith('test_'):
-                total_tests += 1
-                try:
-                    method = getattr(suite, method_name)
-                    method(benchmark)
-                    passed_tests += 1
-                except Exception as e:
-                    logger.error(f"✗ {method_name} failed: {e}")
-    
-    # Generate report
-    report = benchmark.get_report()
+    report = {
+        'total_tests': len(means),
+        'total_time': total_time,
+        'average_time': total_time / len(means) if means else 0,
+        'fastest_test': fastest if means else None,
+        'slowest_test': slowest if means else None,
+        'details': means
+    }
     
     logger.info("\n" + "="*60)
     logger.info("BENCHMARK RESULTS")
     logger.info("="*60)
-    logger.info(f"Total Tests: {total_tests}")
-    logger.info(f"Passed: {passed_tests}")
-    logger.info(f"Coverage: {(passed_tests/total_tests)*100:.1f}%")
-    logger.info(f"Total Time: {report['total_time']:.3f}s")
-    logger.info(f"Average Time: {report['average_time']:.3f}s")
+    logger.info(f"Benchmarked Tests: {report['total_tests']}")
+    logger.info(f"Total Mean Time: {report['total_time']:.6f}s")
+    logger.info(f"Average Mean Time: {report['average_time']:.6f}s")
     
     if report['fastest_test']:
-        logger.info(f"Fastest: {report['fastest_test'][0]} ({report['fastest_test'][1]:.3f}s)")
+        logger.info(f"Fastest: {report['fastest_test'][0]} ({report['fastest_test'][1]:.6f}s)")
     if report['slowest_test']:
-        logger.info(f"Slowest: {report['slowest_test'][0]} ({report['slowest_test'][1]:.3f}s)")
+        logger.info(f"Slowest: {report['slowest_test'][0]} ({report['slowest_test'][1]:.6f}s)")
     
     logger.info("="*60)
     
     return {
-        'total_tests': total_tests,
-        'passed_tests': passed_tests,
-        'coverage_percent': (passed_tests/total_tests)*100,
+        'exit_code': int(exit_code),
         'benchmark_metrics': report
     }
 
@@ -369,9 +519,8 @@ if __name__ == "__main__":
     result = run_all_benchmarks()
     
     # Exit with appropriate code
-    if result['passed_tests'] == result['total_tests']:
+    if result['exit_code'] == 0:
         logger.info("✓ ALL BENCHMARKS PASSED!")
-        exit(0)
     else:
         logger.error("✗ Some benchmarks failed")
-        exit(1)
+    exit(result['exit_code'])